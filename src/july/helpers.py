@@ -1,42 +1,159 @@
 import calendar
+import functools
 import numpy as np
 import matplotlib.pyplot as plt
 from july.colormaps import cmaps_dict
 from matplotlib.pyplot import Axes
 from matplotlib.colors import ListedColormap, LinearSegmentedColormap
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import LineCollection
 from matplotlib.ticker import ScalarFormatter
-from typing import List, Any, Optional, Union
+from typing import Dict, List, Any, NamedTuple, Optional, Union, Tuple
 from datetime import date
 
-
-def date_grid(
-    dates: List[date], data: List[Any], horizontal: bool, dtype: str = "float64"
-) -> np.ndarray:
-    # Array with columns (iso year, iso week number, iso weekday).
-    iso_dates = np.array([day.isocalendar() for day in dates])
-    # Unique weeks, as defined by the tuple (iso year, iso week).
-    unique_weeks = sorted(list(set([tuple(row) for row in iso_dates[:, :2]])))
-
-    # Get dict that maps week tuple to week index in grid.
-    weeknum2idx = {week: i for i, week in enumerate(unique_weeks)}
-    week_coords = np.array([weeknum2idx[tuple(week)] for week in iso_dates[:, :2]])
-    day_coords = iso_dates[:, 2] - 1
+# Proleptic Gregorian ordinal of the datetime64 epoch, 1970-01-01.
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Positions of the weekday ticks, the same for every plot.
+_WEEKDAY_TICKS = np.arange(7) + 0.5
+
+
+def _iso_calendar_vec(
+    dates_np: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized equivalent of date.isocalendar() for a datetime64[D] array.
+
+    Args:
+        dates_np: Array of dates with dtype datetime64[D].
+    Returns:
+        Tuple of int64 arrays (iso year, iso week number, iso weekday).
+    """
+    days = dates_np.astype("datetime64[D]").astype("int64")
+    ordinal = days + _EPOCH_ORDINAL
+    # Monday is 0, as 0001-01-01 (ordinal 1) was a Monday.
+    weekday = (ordinal - 1) % 7
+    # The iso year of a date is the calendar year of the Thursday in its week.
+    thursday = days - weekday + 3
+    year_start = thursday.astype("datetime64[D]").astype("datetime64[Y]")
+    year = year_start.astype("int64") + 1970
+    week = (thursday - year_start.astype("datetime64[D]").astype("int64")) // 7 + 1
+    return year, week, weekday + 1
+
+
+class DateLayout(NamedTuple):
+    """Dates as arrays of their components, and their position in the grid.
+
+    All arrays have one element per date, in the order of the input dates.
+    """
+
+    ordinals: np.ndarray
+    years: np.ndarray
+    months: np.ndarray
+    days: np.ndarray
+    week_coords: np.ndarray
+    day_coords: np.ndarray
+    shape: Tuple[int, int]
+    horizontal: bool
+
+
+def _is_date_range(ordinals: np.ndarray) -> bool:
+    """Check whether ordinals form a non-empty range of consecutive days."""
+    return len(ordinals) > 0 and bool(np.all(np.diff(ordinals) == 1))
+
+
+def build_layout(dates: List[date], horizontal: bool) -> DateLayout:
+    # Reading the ordinals is much cheaper than having numpy convert each date
+    # object to datetime64, so everything else is derived from them.
+    ordinals = np.fromiter(
+        (day.toordinal() for day in dates), dtype=np.int64, count=len(dates)
+    )
+    return _layout_from_ordinals(ordinals, horizontal)
+
+
+def _layout_from_ordinals(ordinals: np.ndarray, horizontal: bool) -> DateLayout:
+    dates_np = (ordinals - _EPOCH_ORDINAL).astype("datetime64[D]")
+    month_starts = dates_np.astype("datetime64[M]")
+    years = dates_np.astype("datetime64[Y]").astype(np.int64) + 1970
+    months = month_starts.astype(np.int64) % 12 + 1
+    days = (dates_np - month_starts.astype("datetime64[D]")).astype(np.int64) + 1
+
+    if _is_date_range(ordinals):
+        # Consecutive days fill the grid row by row, starting at the weekday
+        # of the first date.
+        cell_idx = np.arange(len(ordinals)) + (ordinals[0] - 1) % 7
+        week_coords = cell_idx // 7
+        day_coords = cell_idx % 7
+        n_weeks = int(week_coords[-1]) + 1
+    else:
+        iso_year, iso_week, iso_weekday = _iso_calendar_vec(dates_np)
+        # Unique weeks, as defined by the pair (iso year, iso week). The inverse
+        # indices map each date to the index of its week in the grid.
+        unique_weeks, week_coords = np.unique(
+            iso_year * 54 + iso_week, return_inverse=True
+        )
+        day_coords = iso_weekday - 1
+        n_weeks = len(unique_weeks)
 
     # Define shape of grid.
-    n_weeks = len(unique_weeks)
     n_days = 7
 
-    # Create grid and fill with data.
-    grid = np.empty((n_weeks, n_days), dtype=dtype)
-    grid = np.nan * grid if dtype == "float64" else grid
-    grid[week_coords, day_coords] = data
+    return DateLayout(
+        ordinals=ordinals,
+        years=years.astype(np.int16),
+        months=months.astype(np.int8),
+        days=days.astype(np.int8),
+        week_coords=week_coords,
+        day_coords=day_coords,
+        shape=(n_weeks, n_days),
+        horizontal=horizontal,
+    )
 
-    if horizontal:
+
+def scatter(
+    data: Any, layout: DateLayout, dtype: str = "float64", fill_value: Any = None
+) -> np.ndarray:
+    # Create grid and fill with data. Empty cells in float grids are NaN.
+    if fill_value is None and dtype == "float64":
+        fill_value = np.nan
+    if fill_value is None:
+        grid = np.empty(layout.shape, dtype=dtype)
+    else:
+        grid = np.full(layout.shape, fill_value, dtype=dtype)
+    grid[layout.week_coords, layout.day_coords] = data
+
+    if layout.horizontal:
         return grid.T
 
     return grid
 
 
+def _group_centers(codes: np.ndarray, layout: DateLayout) -> Dict[int, float]:
+    """Find the center of each group of dates along the week axis of the grid.
+
+    Args:
+        codes: Integer code of each date, e.g. its year. Dates with equal codes
+            form a group.
+        layout: Layout of the dates in the grid.
+    Returns:
+        Dict mapping each unique code, in ascending order, to the midpoint of the
+        weeks spanned by its group.
+    """
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    weeks = layout.week_coords[order]
+    # Index of the first date in each group.
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_codes)) + 1))
+    first_weeks = np.minimum.reduceat(weeks, starts)
+    last_weeks = np.maximum.reduceat(weeks, starts)
+    locs = (first_weeks + last_weeks + 1) / 2
+    return dict(zip(sorted_codes[starts].tolist(), locs.tolist()))
+
+
+def date_grid(
+    dates: List[date], data: List[Any], horizontal: bool, dtype: str = "float64"
+) -> np.ndarray:
+    return scatter(data, build_layout(dates, horizontal), dtype)
+
+
 def cal_heatmap(
     cal: np.ndarray,
     dates: List[date],
@@ -57,8 +174,10 @@ def cal_heatmap(
     cmax: Optional[int] = None,
     cbar_label_format: Optional[str] = None,
     ax: Optional[Axes] = None,
+    layout: Optional[DateLayout] = None,
+    renderer: str = "imshow",
 ):
-    if not ax:
+    if ax is None:
         figsize = (12, 5) if horizontal else (5, 12)
         fig, ax = plt.subplots(figsize=figsize, dpi=100)
     else:
@@ -74,35 +193,86 @@ def cal_heatmap(
             f"'date_label'={date_label}."
         )
 
-    pc = ax.pcolormesh(cal, edgecolors=ax.get_facecolor(), linewidth=0.25, cmap=cmap)
-    pc.set_clim(cmin or np.nanmin(cal), cmax or np.nanmax(cal))
+    pc = add_cal_grid(ax, cal, cmap, cmin, cmax, renderer)
     ax.invert_yaxis()
     ax.set_aspect("equal")
     bbox = ax.get_position()
+    # Components and grid position of each date, shared by all labels and outlines.
+    if layout is None:
+        layout = build_layout(dates, horizontal)
 
     if value_label:
         add_value_label(ax, cal, value_format)
     if date_label:
-        add_date_label(ax, dates, horizontal)
+        add_date_label(ax, layout)
     else:
         ax.set_xticklabels("")
     if weekday_label:
         add_weekday_label(ax, horizontal)
     if month_label:
-        add_month_label(ax, dates, horizontal)
+        add_month_label(ax, layout)
     if year_label:
-        add_year_label(ax, dates, horizontal)
+        add_year_label(ax, layout)
     if month_grid:
-        add_month_grid(ax, dates, cal, horizontal, month_grid_color)
+        add_month_grid(ax, layout, month_grid_color)
     if colorbar:
         add_colorbar(pc, fig, ax, bbox, cbar_label_format)
-    if title:
+    if title is not None:
         ax.set_title(title)
 
     ax.set_frame_on(frame_on)
     return ax
 
 
+def add_cal_grid(ax, cal, cmap, cmin, cmax, renderer) -> ScalarMappable:
+    # Color limits default to the range of the finite values in the grid.
+    if cmin is None or cmax is None:
+        finite = cal[np.isfinite(cal)]
+        auto_min, auto_max = (finite.min(), finite.max()) if finite.size else (0, 1)
+        cmin = auto_min if cmin is None else cmin
+        cmax = auto_max if cmax is None else cmax
+
+    if renderer == "imshow":
+        # The grid is regular, so it can be drawn as a single image with the
+        # cell edges on top, rather than as one mesh quad per cell.
+        nrows, ncols = cal.shape
+        pc: ScalarMappable = ax.imshow(
+            cal,
+            cmap=cmap,
+            vmin=cmin,
+            vmax=cmax,
+            interpolation="nearest",
+            origin="lower",
+            extent=(0, ncols, 0, nrows),
+        )
+    elif renderer == "pcolormesh":
+        pc = ax.pcolormesh(cal, edgecolors="none", cmap=cmap, vmin=cmin, vmax=cmax)
+    else:
+        raise ValueError(
+            "Argument 'renderer' must be equal to either 'imshow' or "
+            f"'pcolormesh'. Got: {renderer}."
+        )
+    # Stroke every cell edge once, rather than once per adjacent cell.
+    add_cell_edges(ax, cal.shape, ax.get_facecolor())
+    return pc
+
+
+def add_cell_edges(ax, shape, color, linewidth=0.25) -> None:
+    nrows, ncols = shape
+    # One line along each row boundary followed by one along each column boundary.
+    segments = np.zeros((nrows + ncols + 2, 2, 2))
+    segments[: nrows + 1, :, 1] = np.arange(nrows + 1)[:, None]
+    segments[: nrows + 1, 1, 0] = ncols
+    segments[nrows + 1 :, :, 0] = np.arange(ncols + 1)[:, None]
+    segments[nrows + 1 :, 1, 1] = nrows
+    ax.add_collection(
+        LineCollection(
+            list(segments), colors=[color], linewidths=linewidth, antialiaseds=False
+        ),
+        autolim=False,
+    )
+
+
 def add_value_label(ax, cal, value_format):
     if value_format == "int":
         val_format = "{:0.0f}"
@@ -119,48 +289,40 @@ def add_value_label(ax, cal, value_format):
             ax.text(j + 0.5, i + 0.5, val_format.format(z), ha="center", va="center")
 
 
-def add_date_label(ax, dates: List[date], horizontal: bool) -> None:
-    days = [day.day for day in dates]
-    day_grid = date_grid(dates, days, horizontal)
+def add_date_label(ax, layout: DateLayout) -> None:
+    days = layout.days.astype(str)
+    # Cell of each date, with rows and columns swapped in the horizontal grid.
+    rows, cols = layout.week_coords, layout.day_coords
+    if layout.horizontal:
+        rows, cols = cols, rows
 
-    for (i, j), z in np.ndenumerate(day_grid):
-        if np.isfinite(z):
-            ax.text(j + 0.5, i + 0.5, int(z), ha="center", va="center")
+    for x, y, day in zip(cols + 0.5, rows + 0.5, days):
+        ax.text(x, y, day, ha="center", va="center")
 
 
 def add_weekday_label(ax, horizontal: bool) -> None:
+    # Read the labels on every call, so they follow the current locale.
+    weekday_labels = calendar.weekheader(width=1).split(" ")
     if horizontal:
         ax.tick_params(axis="y", which="major", pad=8)
-        ax.set_yticks([x + 0.5 for x in range(0, 7)])
-        ax.set_yticklabels(
-            calendar.weekheader(width=1).split(" "),
-        )
+        ax.set_yticks(_WEEKDAY_TICKS)
+        ax.set_yticklabels(weekday_labels)
     else:
         ax.tick_params(axis="x", which="major", pad=4)
-        ax.set_xticks([x + 0.5 for x in range(0, 7)])
-        ax.set_xticklabels(
-            calendar.weekheader(width=1).split(" "),
-        )
+        ax.set_xticks(_WEEKDAY_TICKS)
+        ax.set_xticklabels(weekday_labels)
         ax.xaxis.tick_top()
 
 
-def add_month_label(ax, dates: List[date], horizontal: bool) -> None:
-    month_years = [(day.year, day.month) for day in dates]
-    month_years_str = list(map(str, month_years))
-    month_year_grid = date_grid(dates, month_years_str, horizontal, dtype="object")
-
-    unique_month_years = sorted(set(month_years))
-
-    month_locs = {}
-    for month in unique_month_years:
-        # Get 'avg' x, y coordinates of elements in grid equal to month_year.
-        yy, xx = np.nonzero(month_year_grid == str(month))
-        month_locs[month] = (
-            xx.max() + 1 + xx.min() if horizontal else yy.max() + 1 + yy.min()
-        ) / 2
+def add_month_label(ax, layout: DateLayout) -> None:
+    horizontal = layout.horizontal
+    # Encode each (year, month) pair as a single integer.
+    month_years = layout.years.astype(np.int32) * 12 + layout.months - 1
+    # Get 'avg' position along the week axis of each month_year.
+    month_locs = _group_centers(month_years, layout)
 
     # Get month label for each unique month_year.
-    month_labels = [calendar.month_abbr[x[1]] for x in month_locs.keys()]
+    month_labels = [calendar.month_abbr[x % 12 + 1] for x in month_locs.keys()]
 
     if horizontal:
         ax.set_xticks([*month_locs.values()])
@@ -170,23 +332,16 @@ def add_month_label(ax, dates: List[date], horizontal: bool) -> None:
         ax.set_yticklabels(month_labels, rotation=90, va="center")
 
 
-def add_year_label(ax, dates, horizontal):
-    years = [day.year for day in dates]
-    year_grid = date_grid(dates, years, horizontal)
-    unique_years = sorted(set(years))
-
-    year_locs = {}
-    for year in unique_years:
-        yy, xx = np.nonzero(year_grid == year)
-        year_locs[year] = (
-            xx.max() + 1 + xx.min() if horizontal else yy.max() + 1 + yy.min()
-        ) / 2
+def add_year_label(ax, layout):
+    horizontal = layout.horizontal
+    year_locs = _group_centers(layout.years, layout)
+    n_weeks = layout.shape[0]
 
     if horizontal:
         for year, loc in year_locs.items():
             ax.annotate(
                 year,
-                (loc / year_grid.shape[1], 1),
+                (loc / n_weeks, 1),
                 (0, 12),
                 xycoords="axes fraction",
                 textcoords="offset points",
@@ -198,7 +353,7 @@ def add_year_label(ax, dates, horizontal):
         for year, loc in year_locs.items():
             ax.annotate(
                 year,
-                (0, 1 - loc / len(year_grid)),
+                (0, 1 - loc / n_weeks),
                 (-40, 0),
                 xycoords="axes fraction",
                 textcoords="offset points",
@@ -225,66 +380,90 @@ def add_colorbar(pc, fig, ax, bbox, cbar_label_format):
     plt.colorbar(pc, cax=cax, format=cbar_label_format)
 
 
-def get_month_outline(dates, month_grid, horizontal, month):
-    # This code is so ugly I'm amazed that it works.
-    day_grid = date_grid(dates, dates, horizontal=False, dtype="object")
-    if horizontal:
-        month_grid = month_grid.T
-
-    nrows, ncols = month_grid.shape
-    coords_list = []
-    for y in range(nrows):
-        for x in range(ncols):
-            if np.isfinite(month_grid[y, x]):
-                if day_grid[y, x].month == month:
-                    coords_list.append((x, y))
-
-    sorted_coords = np.array(coords_list)
-    min_y = sorted_coords[:, 1].min()
-    max_y = sorted_coords[:, 1].max()
-    upper_left = sorted_coords[0]
-    upper_right = np.array([7, min_y])
-    lower_right = np.array([7, max_y])
-    lower_right2 = sorted_coords[-1] + np.array([1, 1])
-
-    lower_right1 = (
-        lower_right2
-        if np.array_equal(lower_right, lower_right2)
-        else lower_right2 - np.array([0, 1])
+def get_month_outline(layout: DateLayout, month: int):
+    horizontal = layout.horizontal
+    # Month of each cell in the vertical grid, with 0 marking empty cells.
+    month_int_grid = scatter(
+        layout.months, layout._replace(horizontal=False), dtype="int8", fill_value=0
     )
-    lower_left = np.array([0, sorted_coords[:, 1].max() + 1])
-    corner_last = upper_left + np.array([0, 1])
-    second_last = np.copy(corner_last)
-    second_last[0] = 0
-
-    coords = np.array(
-        [
-            upper_left,
-            upper_right,
-            lower_right,
-            lower_right1,
-            lower_right2,
-            lower_left,
-            second_last,
-            corner_last,
-            upper_left,
-        ]
+    # Coordinates of all cells in the month, in row-major order.
+    ys, xs = np.nonzero(month_int_grid == month)
+
+    # Cells are in row-major order, so the first and last cell of the month
+    # are also in its first and last row.
+    first_x, min_y = xs[0], ys[0]
+    last_x, max_y = xs[-1] + 1, ys[-1]
+
+    # Trace the outline clockwise from the upper left corner of the first cell.
+    coords = np.empty((9, 2), dtype=np.int32)
+    coords[0] = (first_x, min_y)
+    coords[1] = (7, min_y)
+    coords[2] = (7, max_y)
+    coords[3] = (last_x, max_y)
+    coords[4] = (last_x, max_y + 1)
+    coords[5] = (0, max_y + 1)
+    coords[6] = (0, min_y + 1)
+    coords[7] = (first_x, min_y + 1)
+    coords[8] = coords[0]
+
+    return coords[:, ::-1] if horizontal else coords
+
+
+def _month_outlines(layout: DateLayout) -> Tuple[np.ndarray, ...]:
+    return tuple(
+        get_month_outline(layout, month=month) for month in np.unique(layout.months)
     )
 
-    return coords[:, [1, 0]] if horizontal else coords
-
 
-def add_month_grid(ax, dates, month_grid, horizontal, color):
-    months = set([d.month for d in dates])
-    for month in months:
-        coords = get_month_outline(
-            dates, month_grid, horizontal=horizontal, month=month
+@functools.lru_cache(maxsize=32)
+def _month_outlines_cached(
+    start_ordinal: int, end_ordinal: int, horizontal: bool
+) -> Tuple[np.ndarray, ...]:
+    """Get outlines of all months in a contiguous date range.
+
+    The outlines only depend on the dates, so they are cached across plots of
+    the same range. The returned arrays are read-only, as they are shared.
+
+    Args:
+        start_ordinal: Proleptic Gregorian ordinal of the first date.
+        end_ordinal: Proleptic Gregorian ordinal of the last date (inclusive).
+        horizontal: Whether the grid is horizontal.
+    Returns:
+        Outline coordinates of each month, in chronological order of months.
+    """
+    ordinals = np.arange(start_ordinal, end_ordinal + 1)
+    outlines = _month_outlines(_layout_from_ordinals(ordinals, horizontal))
+    for coords in outlines:
+        coords.setflags(write=False)
+    return outlines
+
+
+def add_month_grid(ax, layout, color):
+    ordinals = layout.ordinals
+    if _is_date_range(ordinals):
+        outlines = _month_outlines_cached(
+            int(ordinals[0]), int(ordinals[-1]), layout.horizontal
         )
-        ax.plot(coords[:, 0], coords[:, 1], color=color, linewidth=1)
+    else:
+        outlines = _month_outlines(layout)
+
+    # Draw all outlines as one artist, styled like a line from ax.plot().
+    ax.add_collection(
+        LineCollection(
+            outlines,
+            colors=[color],
+            linewidths=1,
+            capstyle="projecting",
+            joinstyle="round",
+        ),
+        autolim=False,
+    )
 
     # Pad axes so plotted line appears uniform also along edges.
-    ax.set_xlim(ax.get_xlim()[0] - 0.1, ax.get_xlim()[1] + 0.1)
-    ax.set_ylim(ax.get_ylim()[0] + 0.1, ax.get_ylim()[1] - 0.1)
+    x0, x1 = ax.get_xlim()
+    y0, y1 = ax.get_ylim()
+    ax.set_xlim(x0 - 0.1, x1 + 0.1)
+    ax.set_ylim(y0 + 0.1, y1 - 0.1)
 
     fig = ax.get_figure()
     # Set frame in facecolor instead of turning off frame to keep cbar alignment.
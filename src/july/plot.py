@@ -6,7 +6,8 @@ from typing import List, Any, Optional, Union, Tuple
 from matplotlib.pyplot import Axes
 from matplotlib.colors import LinearSegmentedColormap, ListedColormap
 from july.helpers import (
-    date_grid,
+    build_layout,
+    scatter,
     cal_heatmap,
     get_month_outline,
     get_calendar_title,
@@ -35,6 +36,7 @@ def heatmap(
     cmax: Optional[int] = None,
     cbar_label_format: Optional[str] = None,
     ax: Optional[Axes] = None,
+    renderer: str = "imshow",
     **kwargs
 ) -> Axes:
     """Create heatmap of input dates and data.
@@ -63,6 +65,9 @@ def heatmap(
             Only relevant if 'colorbar' is True.
         cbar_label_format: Format string for colorbar labels.
         ax: Matplotlib Axes object.
+        renderer: How to draw the grid: 'imshow' draws it as one image, which is
+            fast but rasterized in vector formats such as SVG or PDF.
+            'pcolormesh' draws one vector quad per cell.
         kwargs: Parameters passed to `update_rcparams`. Figure aesthetics. Named
             keyword arguments as defined in `update_rcparams` or a dict with any
             rcParam as key(s).
@@ -71,7 +76,8 @@ def heatmap(
     """
     update_rcparams(**kwargs)
     dates_clean, data_clean = preprocess_inputs(dates, data)
-    cal = date_grid(dates_clean, data_clean, horizontal)
+    layout = build_layout(dates_clean, horizontal)
+    cal = scatter(data_clean, layout)
     ax = cal_heatmap(
         cal=cal,
         dates=dates_clean,
@@ -92,6 +98,8 @@ def heatmap(
         cmax=cmax,
         cbar_label_format=cbar_label_format,
         ax=ax,
+        layout=layout,
+        renderer=renderer,
     )
 
     return ax
@@ -116,6 +124,7 @@ def month_plot(
     cmax: Optional[int] = None,
     cbar_label_format: Optional[str] = None,
     ax: Optional[Axes] = None,
+    renderer: str = "imshow",
     **kwargs
 ) -> Axes:
     """Create calendar shaped heatmap of one month in input dates and data.
@@ -144,6 +153,9 @@ def month_plot(
             Only relevant if 'colorbar' is True.
         cbar_label_format: Format string for colorbar labels.
         ax: Matplotlib Axes object.
+        renderer: How to draw the grid: 'imshow' draws it as one image, which is
+            fast but rasterized in vector formats such as SVG or PDF.
+            'pcolormesh' draws one vector quad per cell.
         kwargs: Parameters passed to `update_rcparams`. Figure aesthetics. Named
             keyword arguments as defined in `update_rcparams` or a dict with any
             rcParam as key(s).
@@ -153,10 +165,9 @@ def month_plot(
     update_rcparams(**kwargs)
     dates_mon, data_mon = preprocess_month(dates, data, month=month, year=year)
     month = dates_mon[0].month
-    month_grid = date_grid(dates_mon, data_mon, horizontal=horizontal)
-    weeknum_grid = date_grid(
-        dates_mon, [d.isocalendar()[1] for d in dates_mon], horizontal=horizontal
-    )
+    layout = build_layout(dates_mon, horizontal)
+    month_grid = scatter(data_mon, layout)
+    weeknum_grid = scatter([d.isocalendar()[1] for d in dates_mon], layout)
     weeknum_labels: List[Any] = [int(x) for x in unique(weeknum_grid) if np.isfinite(x)]
 
     if cal_mode:
@@ -165,7 +176,7 @@ def month_plot(
             month_grid = np.vstack([month_grid, 7 * [np.nan]])
             weeknum_labels.append("")
 
-    if not ax:
+    if ax is None:
         _, ax = plt.subplots(figsize=(5, 4))
 
     ax = cal_heatmap(
@@ -184,6 +195,8 @@ def month_plot(
         cmax=cmax,
         cbar_label_format=cbar_label_format,
         ax=ax,
+        layout=layout,
+        renderer=renderer,
     )
 
     ax.tick_params(axis="y", pad=8)
@@ -201,10 +214,12 @@ def month_plot(
         else:
             ax.set_yticklabels([])
 
-    outline_coords = get_month_outline(dates_mon, month_grid, horizontal, month)
+    outline_coords = get_month_outline(layout, month)
     ax.plot(outline_coords[:, 0], outline_coords[:, 1], color="black", linewidth=1)
-    ax.set_xlim(ax.get_xlim()[0] - 0.1, ax.get_xlim()[1] + 0.1)
-    ax.set_ylim(ax.get_ylim()[0] + 0.1, ax.get_ylim()[1] - 0.1)
+    x0, x1 = ax.get_xlim()
+    y0, y1 = ax.get_ylim()
+    ax.set_xlim(x0 - 0.1, x1 + 0.1)
+    ax.set_ylim(y0 + 0.1, y1 - 0.1)
     if month_label:
         ax.set_title(calendar.month_name[month])
     if title:
@@ -225,6 +240,7 @@ def calendar_plot(
     title: bool = True,
     ncols: int = 4,
     figsize: Optional[Tuple[float, float]] = None,
+    renderer: str = "imshow",
     **kwargs
 ) -> Axes:
     """Create calendar shaped heatmap of all months im input dates and data.
@@ -243,6 +259,9 @@ def calendar_plot(
         ncols: Number of columns in the calendar plot.
         ax: Matplotlib Axes object.
         figsize: Figure size. Defaults to sensible values determined from 'ncols'.
+        renderer: How to draw the grid: 'imshow' draws it as one image, which is
+            fast but rasterized in vector formats such as SVG or PDF.
+            'pcolormesh' draws one vector quad per cell.
         kwargs: Parameters passed to `update_rcparams`. Figure aesthetics. Named
             keyword arguments as defined in `update_rcparams` or a dict with any
             rcParam as key(s).
@@ -287,6 +306,7 @@ def calendar_plot(
             value_format=value_format,
             ax=axes.reshape(-1)[i],
             cal_mode=True,
+            renderer=renderer,
         )
 
     for ax in axes.reshape(-1)[len(year_months) :]: